@@ -0,0 +1,83 @@
+//! Backend selection for the 16-hex-character SHA-256 helpers exposed to Python.
+//!
+//! CPU features are probed once per process. SHA-NI hashes a single message
+//! about as fast as the eight-lane AVX2 kernel hashes eight, so it is preferred;
+//! the AVX2 multi-buffer kernel serves CPUs without SHA-NI, and the scalar
+//! kernel everything else. Every kernel is compiled into the same binary behind
+//! `#[target_feature]`, so one wheel per platform covers all of them.
+
+use std::sync::OnceLock;
+
+use crate::{sha256, sha256_avx2};
+
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum Backend {
+    ShaNi,
+    Avx2,
+    Scalar,
+}
+
+impl Backend {
+    pub fn name(self) -> &'static str {
+        match self {
+            Backend::ShaNi => "sha_ni",
+            Backend::Avx2 => "avx2",
+            Backend::Scalar => "scalar",
+        }
+    }
+}
+
+/// The kernel used for hashing on this CPU.
+pub fn backend() -> Backend {
+    static BACKEND: OnceLock<Backend> = OnceLock::new();
+    *BACKEND.get_or_init(|| {
+        if sha256::has_shani() {
+            Backend::ShaNi
+        } else if sha256_avx2::has_avx2() {
+            Backend::Avx2
+        } else {
+            Backend::Scalar
+        }
+    })
+}
+
+/// First 16 hex characters of the SHA-256 digest of `data`.
+pub fn hash16(data: &[u8]) -> String {
+    sha256::hex16(&sha256::digest(data))
+}
+
+/// First 16 hex characters of the SHA-256 digest of every input, using the selected backend.
+pub fn hash16_many<T: AsRef<[u8]>>(inputs: &[T]) -> Vec<String> {
+    match backend() {
+        Backend::Avx2 => sha256_avx2::hash16_many(inputs),
+        Backend::ShaNi | Backend::Scalar => sha256::hash16_batch(inputs),
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn prefers_shani_then_avx2() {
+        let expected = if sha256::has_shani() {
+            Backend::ShaNi
+        } else if sha256_avx2::has_avx2() {
+            Backend::Avx2
+        } else {
+            Backend::Scalar
+        };
+        assert_eq!(backend(), expected);
+    }
+
+    #[test]
+    fn backends_agree() {
+        let inputs: Vec<Vec<u8>> = (0..100u32)
+            .map(|n| (0..n).map(|i| (i * 13 + n) as u8).collect())
+            .collect();
+        let single: Vec<String> = inputs.iter().map(|data| hash16(data)).collect();
+        assert_eq!(hash16_many(&inputs), single);
+        assert_eq!(sha256_avx2::hash16_many(&inputs), single);
+        assert_eq!(hash16(b"abc"), "ba7816bf8f01cfea");
+    }
+}
@@ -1,15 +1,55 @@
 use pyo3::prelude::*;
+use pyo3::pybacked::PyBackedBytes;
+
+mod hash16;
+mod sha256;
+mod sha256_avx2;
 
 #[pyfunction]
 fn hello_from_bin() -> String {
     "Hello from memu!".to_string()
 }
 
+/// Return the first 16 hex characters of the SHA-256 digest of every input.
+#[pyfunction]
+fn sha256_16hex_batch(inputs: Vec<PyBackedBytes>) -> Vec<String> {
+    sha256::hash16_batch(&inputs)
+}
+
+/// Like `sha256_16hex_batch`, but hashes groups of eight inputs in parallel AVX2 lanes on CPUs without SHA-NI.
+#[pyfunction]
+fn sha256_16hex_many(inputs: Vec<PyBackedBytes>) -> Vec<String> {
+    hash16::hash16_many(&inputs)
+}
+
+/// Return the first 16 hex characters of the SHA-256 digest of `data`.
+#[pyfunction]
+fn sha256_16hex(data: &[u8]) -> String {
+    hash16::hash16(data)
+}
+
+/// Name of the SHA-256 kernel selected for this CPU: "sha_ni", "avx2" or "scalar".
+#[pyfunction]
+fn sha256_backend() -> &'static str {
+    hash16::backend().name()
+}
+
+/// Whether the CPU supports the SHA-NI extension.
+#[pyfunction]
+fn cpu_supports_shani() -> bool {
+    sha256::has_shani()
+}
+
 /// A Python module implemented in Rust. The name of this function must match
 /// the `lib.name` setting in the `Cargo.toml`, else Python will not be able to
 /// import the module.
 #[pymodule]
 fn _core(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(hello_from_bin, m)?)?;
+    m.add_function(wrap_pyfunction!(sha256_16hex_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(sha256_16hex_many, m)?)?;
+    m.add_function(wrap_pyfunction!(sha256_16hex, m)?)?;
+    m.add_function(wrap_pyfunction!(sha256_backend, m)?)?;
+    m.add_function(wrap_pyfunction!(cpu_supports_shani, m)?)?;
     Ok(())
 }
@@ -1 +1,6 @@
 def hello_from_bin() -> str: ...
+def sha256_16hex_batch(inputs: list[bytes]) -> list[str]: ...
+def sha256_16hex_many(inputs: list[bytes]) -> list[str]: ...
+def sha256_16hex(data: bytes) -> str: ...
+def sha256_backend() -> str: ...
+def cpu_supports_shani() -> bool: ...
@@ -1,13 +1,41 @@
 from __future__ import annotations
 
+import copy
+import functools
 import hashlib
 import json
-import uuid
-from datetime import datetime
-from typing import Any, Literal
+import math
+import os
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import MISSING, dataclass, field, fields
+from datetime import UTC, datetime
+from typing import Any, Literal, Self
+
+import orjson
+import xxhash
+from pydantic import BaseModel, ConfigDict, Field, ModelWrapValidatorHandler, computed_field, model_validator
+
+# Fresh SHA-256 state; copy() duplicates it instead of initializing a new context per hash
+_SHA256_PROTO = hashlib.sha256()
+
+# Hash kernels are bound once at import: the native extension picks SHA-NI, AVX2 or scalar
+# code for this CPU on first use; without it, hashlib fills in.
+try:
+    from memu._core import sha256_16hex as _hash16
+    from memu._core import sha256_16hex_batch, sha256_16hex_many
+except ImportError:  # pragma: no cover - native extension not built
+
+    def _hash16(data: bytes) -> str:
+        hasher = _SHA256_PROTO.copy()
+        hasher.update(data)
+        return hasher.digest()[:8].hex()
+
+    def sha256_16hex_batch(inputs: list[bytes]) -> list[str]:
+        return [_hash16(data) for data in inputs]
+
+    sha256_16hex_many = sha256_16hex_batch
 
-import pendulum
-from pydantic import BaseModel, ConfigDict, Field
 
 MemoryType = Literal["profile", "event", "knowledge", "behavior", "skill", "tool"]
 
@@ -26,22 +54,127 @@ def compute_content_hash(summary: str, memory_type: str) -> str:
     Returns:
         A 16-character hex hash string
     """
+    return _hash16(_normalize_content(summary, memory_type))
+
+
+def compute_content_hash_batch(summaries: Iterable[str], memory_type: str) -> list[str]:
+    """
+    Generate deduplication hashes for many summaries of the same memory type.
+
+    Produces the same hashes as calling compute_content_hash on each summary, but
+    hashes the whole batch in a single call into the native extension when available.
+
+    Args:
+        summaries: The memory summary texts
+        memory_type: The type of memory shared by all summaries
+
+    Returns:
+        A list of 16-character hex hash strings, in input order
+    """
+    return sha256_16hex_batch([_normalize_content(summary, memory_type) for summary in summaries])
+
+
+def compute_content_hash_many(items: Iterable[tuple[str, str]]) -> list[str]:
+    """
+    Generate deduplication hashes for many (summary, memory_type) pairs.
+
+    Intended for dedup sweeps over large item sets: the native extension hashes
+    eight inputs at a time in parallel SIMD lanes when the CPU supports AVX2.
+
+    Args:
+        items: (summary, memory_type) pairs
+
+    Returns:
+        A list of 16-character hex hash strings, in input order
+    """
+    return sha256_16hex_many([_normalize_content(summary, memory_type) for summary, memory_type in items])
+
+
+def _normalize_content(summary: str, memory_type: str) -> bytes:
     # Normalize: lowercase, strip, collapse whitespace
-    normalized = " ".join(summary.lower().split())
-    content = f"{memory_type}:{normalized}"
-    return hashlib.sha256(content.encode()).hexdigest()[:16]
+    normalized = summary.lower()
+    # Already-normalized text is common and skips the split/join copies. Every whitespace
+    # character except " " is non-printable, so this check is exact.
+    if not (normalized.isprintable() and "  " not in normalized and normalized[:1] != " " and normalized[-1:] != " "):
+        normalized = " ".join(normalized.split())
+    return f"{memory_type}:{normalized}".encode()
+
+
+# Canonical tool input encoding: sorted keys, non-str keys stringified
+_CANONICAL_JSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+
+def _canonical_json(tool_input: dict[str, Any]) -> bytes:
+    """
+    Encode a dict tool input as JSON with sorted keys, so equal inputs hash equally.
+
+    orjson rejects integers beyond 64 bits and writes NaN and infinities as null,
+    which would give them the hash of a None value; those inputs go through the
+    stdlib encoder instead. Values neither encoder supports (e.g. sets, whose
+    order is not stable across processes) raise TypeError rather than being
+    stringified.
+    """
+    try:
+        encoded = orjson.dumps(tool_input, option=_CANONICAL_JSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        pass
+    else:
+        # Only inputs whose encoding has a null can hold a non-finite float
+        if b"null" not in encoded or not _has_non_finite(tool_input):
+            return encoded
+    return json.dumps(tool_input, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _has_non_finite(value: Any) -> bool:
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(v) for v in value.values())
+    if isinstance(value, list | tuple):
+        return any(_has_non_finite(v) for v in value)
+    return False
+
+
+def _tool_call_hash(tool_name: str, tool_input: dict[str, Any] | str, output: str) -> str:
+    """Hash a (tool_name, canonical input, output) triple with xxh3-64."""
+    input_bytes = _canonical_json(tool_input) if isinstance(tool_input, dict) else str(tool_input).encode()
+    hasher = xxhash.xxh3_64(tool_name.encode())
+    hasher.update(b"|")
+    hasher.update(input_bytes)
+    hasher.update(b"|")
+    hasher.update(output.encode())
+    return hasher.hexdigest()
+
+
+def _gen_id() -> str:
+    """Generate a UUIDv7 string: 48-bit millisecond timestamp, then random bits.
+
+    Ids sort by creation time, which keeps database index inserts local. Built
+    with ``bytes.hex()`` rather than ``uuid.UUID``; use ``uuid.uuid4()`` where a
+    purely random v4 id is required.
+    """
+    h = ((time.time_ns() // 1_000_000).to_bytes(6) + os.urandom(10)).hex()
+    # Version nibble 7, variant bits 10
+    return f"{h[:8]}-{h[8:12]}-7{h[13:16]}-{'89ab'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:]}"
 
 
 class BaseRecord(BaseModel):
     """Backend-agnostic record interface."""
 
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    created_at: datetime = Field(default_factory=lambda: pendulum.now("UTC"))
-    updated_at: datetime = Field(default_factory=lambda: pendulum.now("UTC"))
+    id: str = Field(default_factory=_gen_id)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
 
 class ToolCallResult(BaseModel):
-    """Represents the result of a tool invocation for Tool Memory."""
+    """
+    Represents the result of a tool invocation for Tool Memory.
+
+    call_hash is computed from tool_name, input and output on first access and
+    recomputed after any of them is reassigned. When validating a stored record,
+    its call_hash is kept as given rather than recomputed: records written before
+    the switch to xxh3-64 would otherwise get hashes that no longer match.
+    """
 
     tool_name: str = Field(..., description="Name of the tool that was called")
     input: dict[str, Any] | str = Field(default="", description="Tool input parameters")
@@ -50,19 +183,116 @@ class ToolCallResult(BaseModel):
     time_cost: float = Field(default=0.0, description="Time consumed by the tool invocation in seconds")
     token_cost: int = Field(default=-1, description="Token consumption of the tool (-1 if unknown)")
     score: float = Field(default=0.0, description="Quality score from 0.0 to 1.0")
-    call_hash: str = Field(default="", description="Hash of input+output for deduplication")
-    created_at: datetime = Field(default_factory=lambda: pendulum.now("UTC"))
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+    @computed_field(description="Hash of input+output for deduplication")  # type: ignore[prop-decorator]
+    @functools.cached_property
+    def call_hash(self) -> str:
+        """Hash of input+output, computed on first access."""
+        return self.generate_hash()
+
+    def generate_hash(self) -> str:
+        """Generate xxh3-64 hash from tool input and output for deduplication."""
+        return _tool_call_hash(self.tool_name, self.input, self.output)
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _keep_stored_hash(cls, data: Any, handler: ModelWrapValidatorHandler[ToolCallResult]) -> ToolCallResult:
+        stored_hash = data.get("call_hash") if isinstance(data, dict) else None
+        result = handler(data)
+        if stored_hash:
+            # Seed the cached_property, which lives in the instance __dict__
+            result.__dict__["call_hash"] = stored_hash
+        return result
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _HASHED_FIELDS:
+            self.__dict__.pop("call_hash", None)
+        super().__setattr__(name, value)
+
+    def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> Self:
+        copied = super().model_copy(update=update, deep=deep)
+        # update= writes __dict__ directly, bypassing __setattr__
+        if update and not _HASHED_FIELDS.isdisjoint(update):
+            copied.__dict__.pop("call_hash", None)
+        return copied
+
+
+# Fields call_hash is computed from
+_HASHED_FIELDS = frozenset({"tool_name", "input", "output"})
+
+
+@dataclass(slots=True)
+class ToolCallResultFast:
+    """
+    Validation-free counterpart of ToolCallResult for high-rate tool call ingestion.
+
+    Same fields, defaults and hash as ToolCallResult, but construction is a plain
+    attribute assignment sequence. Use ToolCallResult for untrusted external input.
+    """
+
+    tool_name: str
+    input: dict[str, Any] | str = ""
+    output: str = ""
+    success: bool = True
+    time_cost: float = 0.0
+    token_cost: int = -1
+    score: float = 0.0
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    # Backing slot for call_hash: the hashed field values it was computed from, then the hash.
+    # slots=True leaves no __dict__ for cached_property.
+    _call_hash: tuple[str, dict[str, Any] | str, str, str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def call_hash(self) -> str:
+        """Hash of input+output, computed on first access and again after tool_name, input or output is reassigned."""
+        cached = self._call_hash
+        if (
+            cached is None
+            or cached[0] is not self.tool_name
+            or cached[1] is not self.input
+            or cached[2] is not self.output
+        ):
+            cached = self._call_hash = (self.tool_name, self.input, self.output, self.generate_hash())
+        return cached[3]
 
     def generate_hash(self) -> str:
-        """Generate MD5 hash from tool input and output for deduplication."""
-        input_str = json.dumps(self.input, sort_keys=True) if isinstance(self.input, dict) else str(self.input)
-        combined = f"{self.tool_name}|{input_str}|{self.output}"
-        return hashlib.md5(combined.encode("utf-8"), usedforsecurity=False).hexdigest()
+        """Generate xxh3-64 hash from tool input and output for deduplication."""
+        return _tool_call_hash(self.tool_name, self.input, self.output)
 
-    def ensure_hash(self) -> None:
-        """Ensure call_hash is set, generate if empty."""
-        if not self.call_hash:
-            self.call_hash = self.generate_hash()
+    def to_dict(self, *, exclude_defaults: bool = False, exclude: set[str] | None = None) -> dict[str, Any]:
+        """Serialize to the same dict shape as ToolCallResult.model_dump(), honoring the same options.
+
+        A dict input is deep-copied, as model_dump() does, so the result doesn't share it with this call.
+        """
+        data = {
+            "tool_name": self.tool_name,
+            "input": copy.deepcopy(self.input) if isinstance(self.input, dict) else self.input,
+            "output": self.output,
+            "success": self.success,
+            "time_cost": self.time_cost,
+            "token_cost": self.token_cost,
+            "score": self.score,
+            "created_at": self.created_at,
+            "call_hash": self.call_hash,
+        }
+        if exclude_defaults:
+            data = {
+                key: value
+                for key, value in data.items()
+                if key not in _TOOL_CALL_FAST_DEFAULTS or value != _TOOL_CALL_FAST_DEFAULTS[key]
+            }
+        if exclude:
+            for key in exclude:
+                data.pop(key, None)
+        return data
+
+
+_TOOL_CALL_FAST_DEFAULTS = {
+    f.name: f.default for f in fields(ToolCallResultFast) if f.init and f.default is not MISSING
+}
 
 
 class Resource(BaseRecord):
@@ -105,11 +335,24 @@ class CategoryItem(BaseRecord):
     category_id: str
 
 
+# Field names of the core record models, for the scope field overlap check
+_CORE_FIELDS: dict[type[BaseModel], frozenset[str]] = {
+    cls: frozenset(cls.model_fields) for cls in (Resource, MemoryCategory, MemoryItem, CategoryItem)
+}
+
+
+@functools.lru_cache(maxsize=128)
 def merge_scope_model[TBaseRecord: BaseRecord](
     user_model: type[BaseModel], core_model: type[TBaseRecord], *, name_suffix: str
 ) -> type[TBaseRecord]:
-    """Create a scoped model inheriting both the user scope model and the core model."""
-    overlap = set(user_model.model_fields) & set(core_model.model_fields)
+    """
+    Create a scoped model inheriting both the user scope model and the core model.
+
+    Cached per (user_model, core_model, name_suffix), so repeated calls return the same
+    class instead of rebuilding its Pydantic schema.
+    """
+    core_fields = _CORE_FIELDS.get(core_model) or frozenset(core_model.model_fields)
+    overlap = core_fields & user_model.model_fields.keys()
     if overlap:
         msg = f"Scope fields conflict with core model fields: {sorted(overlap)}"
         raise TypeError(msg)
@@ -121,6 +364,7 @@ def merge_scope_model[TBaseRecord: BaseRecord](
     )
 
 
+@functools.lru_cache(maxsize=64)
 def build_scoped_models(
     user_model: type[BaseModel],
 ) -> tuple[type[Resource], type[MemoryCategory], type[MemoryItem], type[CategoryItem]]:
@@ -142,7 +386,10 @@ __all__ = [
     "MemoryType",
     "Resource",
     "ToolCallResult",
+    "ToolCallResultFast",
     "build_scoped_models",
     "compute_content_hash",
+    "compute_content_hash_batch",
+    "compute_content_hash_many",
     "merge_scope_model",
 ]
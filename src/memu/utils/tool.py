@@ -2,23 +2,58 @@
 
 from __future__ import annotations
 
+import functools
 from typing import TYPE_CHECKING, Any
 
+from pydantic import BaseModel, TypeAdapter
+
 if TYPE_CHECKING:
-    from memu.database.models import MemoryItem, ToolCallResult
+    from memu.database.models import MemoryItem, ToolCallResult, ToolCallResultFast
+
+# Tool calls are persisted as a list of dicts, one per call
+_TOOL_CALLS_KEY = "tool_calls"
+# Defaults of every ToolCallResult field that add_tool_call may leave out of a stored call.
+# Models are only imported for type checking here; test_tool_call_defaults_agree keeps this
+# in step with ToolCallResult and ToolCallResultFast.
+_TOOL_CALL_DEFAULTS: dict[str, Any] = {
+    "input": "",
+    "output": "",
+    "success": True,
+    "time_cost": 0.0,
+    "score": 0.0,
+    "token_cost": -1,
+}
+# Unbound dict.get skips the bound-method lookup per call in the statistics loop
+_get = dict.get
+
+
+def _stored_calls(extra: dict[str, Any] | None) -> list[dict[str, Any]]:
+    calls: list[dict[str, Any]] | None = extra.get(_TOOL_CALLS_KEY) if extra else None
+    return calls or []
+
+
+def _writable_extra(item: MemoryItem) -> dict[str, Any]:
+    """Return ``item.extra``, creating it first if it is None."""
+    extra = item.extra
+    if extra is None:
+        extra = item.extra = {}
+    return extra
 
 
 def get_tool_calls(item: MemoryItem) -> list[dict[str, Any]]:
     """Get tool calls from a memory item's extra field.
 
+    Fields omitted from a stored call because they held their default value are
+    filled back in, so every call has input, output, success, time_cost,
+    token_cost and score. The stored list is not modified.
+
     Args:
         item: The MemoryItem to get tool calls from
 
     Returns:
         List of tool call dicts, or empty list if none exist
     """
-    result: list[dict[str, Any]] = (item.extra or {}).get("tool_calls", [])
-    return result
+    return [{**_TOOL_CALL_DEFAULTS, **call} for call in _stored_calls(item.extra)]
 
 
 def set_tool_calls(item: MemoryItem, tool_calls: list[dict[str, Any]]) -> None:
@@ -28,17 +63,22 @@ def set_tool_calls(item: MemoryItem, tool_calls: list[dict[str, Any]]) -> None:
         item: The MemoryItem to set tool calls on
         tool_calls: The list of tool call dicts to set
     """
-    if item.extra is None:
-        item.extra = {}
-    item.extra["tool_calls"] = tool_calls
+    extra = _writable_extra(item)
+    extra[_TOOL_CALLS_KEY] = tool_calls
 
 
-def add_tool_call(item: MemoryItem, tool_call: ToolCallResult) -> None:
+def add_tool_call(
+    item: MemoryItem, tool_call: ToolCallResult | ToolCallResultFast, *, omit_timestamp: bool = False
+) -> None:
     """Add a tool call result to a memory item (for tool type memories).
 
+    Fields still at their default value are not stored; get_tool_calls fills
+    them back in. The call's hash is computed on serialization.
+
     Args:
         item: The MemoryItem to add the tool call to (must be tool type)
-        tool_call: The ToolCallResult to add
+        tool_call: The ToolCallResult (or ToolCallResultFast) to add
+        omit_timestamp: Don't store the call's created_at timestamp
 
     Raises:
         ValueError: If the memory item is not of type 'tool'
@@ -46,10 +86,52 @@ def add_tool_call(item: MemoryItem, tool_call: ToolCallResult) -> None:
     if item.memory_type != "tool":
         msg = "add_tool_call can only be used with tool type memories"
         raise ValueError(msg)
-    tool_call.ensure_hash()
-    tool_calls = get_tool_calls(item)
-    tool_calls.append(tool_call.model_dump())
-    set_tool_calls(item, tool_calls)
+    exclude = {"created_at"} if omit_timestamp else None
+    _writable_extra(item).setdefault(_TOOL_CALLS_KEY, []).append(_dump_call(tool_call, exclude))
+
+
+def _dump_call(tool_call: ToolCallResult | ToolCallResultFast, exclude: set[str] | None) -> dict[str, Any]:
+    if isinstance(tool_call, BaseModel):
+        return tool_call.model_dump(mode="python", exclude_defaults=True, exclude=exclude)
+    return tool_call.to_dict(exclude_defaults=True, exclude=exclude)
+
+
+@functools.cache
+def _tool_call_list_adapter(model: type[BaseModel]) -> TypeAdapter[list[Any]]:
+    # Built on first use per class; models are only imported here for type checking
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+def add_tool_calls_batch(
+    item: MemoryItem, tool_calls: list[ToolCallResult | ToolCallResultFast], *, omit_timestamp: bool = False
+) -> None:
+    """Add many tool call results to a memory item (for tool type memories).
+
+    Stores the same records as calling add_tool_call for each result. A list of
+    a single pydantic model class is serialized in one TypeAdapter dump; mixed
+    lists, or lists of ToolCallResultFast, are serialized one call at a time.
+
+    Args:
+        item: The MemoryItem to add the tool calls to (must be tool type)
+        tool_calls: The ToolCallResults (or ToolCallResultFasts) to add, in call order
+        omit_timestamp: Don't store the calls' created_at timestamps
+
+    Raises:
+        ValueError: If the memory item is not of type 'tool'
+    """
+    if item.memory_type != "tool":
+        msg = "add_tool_calls_batch can only be used with tool type memories"
+        raise ValueError(msg)
+    if not tool_calls:
+        return
+    exclude = {"created_at"} if omit_timestamp else None
+    model = type(tool_calls[0])
+    if issubclass(model, BaseModel) and all(type(call) is model for call in tool_calls):
+        adapter = _tool_call_list_adapter(model)
+        records = adapter.dump_python(tool_calls, mode="python", exclude_defaults=True, exclude=exclude)
+    else:
+        records = [_dump_call(call, exclude) for call in tool_calls]
+    _writable_extra(item).setdefault(_TOOL_CALLS_KEY, []).extend(records)
 
 
 def get_tool_statistics(item: MemoryItem, recent_n: int = 20) -> dict[str, Any]:
@@ -63,7 +145,7 @@ def get_tool_statistics(item: MemoryItem, recent_n: int = 20) -> dict[str, Any]:
         Dictionary with total_calls, recent_calls_analyzed, avg_time_cost,
         success_rate, avg_score, avg_token_cost
     """
-    tool_calls = get_tool_calls(item)
+    tool_calls = _stored_calls(item.extra)
     if not tool_calls:
         return {
             "total_calls": 0,
@@ -77,20 +159,7 @@ def get_tool_statistics(item: MemoryItem, recent_n: int = 20) -> dict[str, Any]:
     recent_calls = tool_calls[-recent_n:]
     recent_count = len(recent_calls)
 
-    # Calculate statistics (tool_calls are now dicts, not ToolCallResult objects)
-    total_time = sum(c.get("time_cost", 0.0) for c in recent_calls)
-    avg_time_cost = total_time / recent_count if recent_count > 0 else 0.0
-
-    successful = sum(1 for c in recent_calls if c.get("success", True))
-    success_rate = successful / recent_count if recent_count > 0 else 0.0
-
-    total_score = sum(c.get("score", 0.0) for c in recent_calls)
-    avg_score = total_score / recent_count if recent_count > 0 else 0.0
-
-    valid_token_calls = [c for c in recent_calls if c.get("token_cost", -1) >= 0]
-    avg_token_cost = (
-        sum(c.get("token_cost", 0) for c in valid_token_calls) / len(valid_token_calls) if valid_token_calls else 0.0
-    )
+    avg_time_cost, success_rate, avg_score, avg_token_cost = _average_calls(recent_calls)
 
     return {
         "total_calls": len(tool_calls),
@@ -100,3 +169,23 @@ def get_tool_statistics(item: MemoryItem, recent_n: int = 20) -> dict[str, Any]:
         "avg_score": round(avg_score, 3),
         "avg_token_cost": round(avg_token_cost, 2),
     }
+
+
+def _average_calls(calls: list[dict[str, Any]]) -> tuple[float, float, float, float]:
+    """Average time cost, success rate, score and known token cost over ``calls`` in a single pass."""
+    total_time = total_score = 0.0
+    successful = 0
+    # Token costs are usually large ints; sum() adds them without boxing each partial total
+    known_tokens: list[int] = []
+    add_tokens = known_tokens.append
+    for c in calls:
+        total_time += _get(c, "time_cost", 0.0)
+        if _get(c, "success", True):
+            successful += 1
+        total_score += _get(c, "score", 0.0)
+        tokens = _get(c, "token_cost", -1)
+        if tokens >= 0:
+            add_tokens(tokens)
+    count = len(calls)
+    avg_token_cost = sum(known_tokens) / len(known_tokens) if known_tokens else 0.0
+    return total_time / count, successful / count, total_score / count, avg_token_cost
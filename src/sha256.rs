@@ -0,0 +1,299 @@
+//! SHA-256 kernels used for content-hash deduplication.
+//!
+//! The compression function is picked once per process: the SHA-NI extension
+//! when the CPU supports it, the portable scalar implementation otherwise.
+
+use std::sync::OnceLock;
+
+pub(crate) const H0: [u32; 8] = [
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+];
+
+pub(crate) const K: [u32; 64] = [
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+];
+
+type CompressFn = fn(&mut [u32; 8], &[[u8; 64]]);
+
+fn compress_scalar(state: &mut [u32; 8], blocks: &[[u8; 64]]) {
+    for block in blocks {
+        let mut w = [0u32; 64];
+        for (i, word) in block.chunks_exact(4).enumerate() {
+            w[i] = u32::from_be_bytes([word[0], word[1], word[2], word[3]]);
+        }
+        for i in 16..64 {
+            let s0 = w[i - 15].rotate_right(7) ^ w[i - 15].rotate_right(18) ^ (w[i - 15] >> 3);
+            let s1 = w[i - 2].rotate_right(17) ^ w[i - 2].rotate_right(19) ^ (w[i - 2] >> 10);
+            w[i] = w[i - 16].wrapping_add(s0).wrapping_add(w[i - 7]).wrapping_add(s1);
+        }
+
+        let [mut a, mut b, mut c, mut d, mut e, mut f, mut g, mut h] = *state;
+        for i in 0..64 {
+            let s1 = e.rotate_right(6) ^ e.rotate_right(11) ^ e.rotate_right(25);
+            let ch = (e & f) ^ (!e & g);
+            let t1 = h.wrapping_add(s1).wrapping_add(ch).wrapping_add(K[i]).wrapping_add(w[i]);
+            let s0 = a.rotate_right(2) ^ a.rotate_right(13) ^ a.rotate_right(22);
+            let maj = (a & b) ^ (a & c) ^ (b & c);
+            let t2 = s0.wrapping_add(maj);
+            h = g;
+            g = f;
+            f = e;
+            e = d.wrapping_add(t1);
+            d = c;
+            c = b;
+            b = a;
+            a = t1.wrapping_add(t2);
+        }
+
+        for (s, v) in state.iter_mut().zip([a, b, c, d, e, f, g, h]) {
+            *s = s.wrapping_add(v);
+        }
+    }
+}
+
+#[cfg(target_arch = "x86_64")]
+mod shani {
+    use super::K;
+    use std::arch::x86_64::*;
+
+    /// Message schedule for the next four words, following the Intel SHA-NI reference code.
+    #[inline]
+    #[target_feature(enable = "sha,ssse3,sse4.1")]
+    fn schedule(w0: __m128i, w1: __m128i, w2: __m128i, w3: __m128i) -> __m128i {
+        let t = _mm_add_epi32(_mm_sha256msg1_epu32(w0, w1), _mm_alignr_epi8(w3, w2, 4));
+        _mm_sha256msg2_epu32(t, w3)
+    }
+
+    /// Compress `blocks` into `state` with the SHA-NI round instructions.
+    ///
+    /// # Safety
+    ///
+    /// The CPU must support the `sha`, `ssse3` and `sse4.1` extensions.
+    #[target_feature(enable = "sha,ssse3,sse4.1")]
+    pub(super) unsafe fn compress(state: &mut [u32; 8], blocks: &[[u8; 64]]) {
+        let mask = _mm_set_epi64x(0x0c0d_0e0f_0809_0a0b, 0x0405_0607_0001_0203);
+        let state_ptr = state.as_mut_ptr().cast::<__m128i>();
+
+        // SAFETY: `state` is 32 bytes long, enough for two unaligned 128-bit loads.
+        let (dcba, hgfe) = unsafe { (_mm_loadu_si128(state_ptr), _mm_loadu_si128(state_ptr.add(1))) };
+        let cdab = _mm_shuffle_epi32(dcba, 0xb1);
+        let efgh = _mm_shuffle_epi32(hgfe, 0x1b);
+        let mut abef = _mm_alignr_epi8(cdab, efgh, 8);
+        let mut cdgh = _mm_blend_epi16(efgh, cdab, 0xf0);
+
+        for block in blocks {
+            let abef_save = abef;
+            let cdgh_save = cdgh;
+            let block_ptr = block.as_ptr().cast::<__m128i>();
+            // SAFETY: every block is 64 bytes long, enough for four unaligned 128-bit loads.
+            let mut w = unsafe {
+                [
+                    _mm_shuffle_epi8(_mm_loadu_si128(block_ptr), mask),
+                    _mm_shuffle_epi8(_mm_loadu_si128(block_ptr.add(1)), mask),
+                    _mm_shuffle_epi8(_mm_loadu_si128(block_ptr.add(2)), mask),
+                    _mm_shuffle_epi8(_mm_loadu_si128(block_ptr.add(3)), mask),
+                ]
+            };
+
+            for i in 0..16 {
+                if i >= 4 {
+                    w[i % 4] = schedule(w[i % 4], w[(i + 1) % 4], w[(i + 2) % 4], w[(i + 3) % 4]);
+                }
+                // SAFETY: `K` holds 64 words, so words 4 * i .. 4 * i + 4 are in bounds.
+                let k = unsafe { _mm_loadu_si128(K.as_ptr().add(4 * i).cast::<__m128i>()) };
+                let wk = _mm_add_epi32(w[i % 4], k);
+                cdgh = _mm_sha256rnds2_epu32(cdgh, abef, wk);
+                abef = _mm_sha256rnds2_epu32(abef, cdgh, _mm_shuffle_epi32(wk, 0x0e));
+            }
+
+            abef = _mm_add_epi32(abef, abef_save);
+            cdgh = _mm_add_epi32(cdgh, cdgh_save);
+        }
+
+        let feba = _mm_shuffle_epi32(abef, 0x1b);
+        let dchg = _mm_shuffle_epi32(cdgh, 0xb1);
+        // SAFETY: same bounds as the loads above.
+        unsafe {
+            _mm_storeu_si128(state_ptr, _mm_blend_epi16(feba, dchg, 0xf0));
+            _mm_storeu_si128(state_ptr.add(1), _mm_alignr_epi8(dchg, feba, 8));
+        }
+    }
+}
+
+#[cfg(target_arch = "x86_64")]
+fn compress_shani(state: &mut [u32; 8], blocks: &[[u8; 64]]) {
+    // SAFETY: only selected by `compress_fn` after the CPU features were detected.
+    unsafe { shani::compress(state, blocks) }
+}
+
+/// Whether the CPU supports the SHA-NI extension (and the SSE levels its kernel uses).
+pub fn has_shani() -> bool {
+    static HAS_SHANI: OnceLock<bool> = OnceLock::new();
+    *HAS_SHANI.get_or_init(|| {
+        #[cfg(target_arch = "x86_64")]
+        if is_x86_feature_detected!("sha")
+            && is_x86_feature_detected!("ssse3")
+            && is_x86_feature_detected!("sse4.1")
+        {
+            return true;
+        }
+        false
+    })
+}
+
+fn compress_fn() -> CompressFn {
+    #[cfg(target_arch = "x86_64")]
+    if has_shani() {
+        return compress_shani;
+    }
+    compress_scalar
+}
+
+fn as_blocks(data: &[u8]) -> &[[u8; 64]] {
+    // SAFETY: `[u8; 64]` has the same alignment as `u8` and the length is rounded down.
+    unsafe { std::slice::from_raw_parts(data.as_ptr().cast(), data.len() / 64) }
+}
+
+/// Number of 64-byte blocks in the padded form of a `len`-byte message.
+pub(crate) fn block_count(len: usize) -> usize {
+    (len + 9).div_ceil(64)
+}
+
+/// Write the complete padded form of `data` into `out`, which must hold `block_count(data.len())` blocks.
+pub(crate) fn pad_into(data: &[u8], out: &mut [[u8; 64]]) {
+    let bytes = out.as_flattened_mut();
+    bytes[..data.len()].copy_from_slice(data);
+    bytes[data.len()] = 0x80;
+    let end = bytes.len();
+    bytes[data.len() + 1..end - 8].fill(0);
+    bytes[end - 8..].copy_from_slice(&((data.len() as u64) * 8).to_be_bytes());
+}
+
+fn digest_with(compress: CompressFn, data: &[u8]) -> [u8; 32] {
+    let mut state = H0;
+    let full = data.len() / 64 * 64;
+    compress(&mut state, as_blocks(&data[..full]));
+
+    // Padding: 0x80, zeros, then the message length in bits as a big-endian u64.
+    let rest = &data[full..];
+    let mut tail = [[0u8; 64]; 2];
+    let n_tail = if rest.len() < 56 { 1 } else { 2 };
+    let tail_bytes = tail.as_flattened_mut();
+    tail_bytes[..rest.len()].copy_from_slice(rest);
+    tail_bytes[rest.len()] = 0x80;
+    tail_bytes[n_tail * 64 - 8..n_tail * 64].copy_from_slice(&((data.len() as u64) * 8).to_be_bytes());
+    compress(&mut state, &tail[..n_tail]);
+    state_to_digest(&state)
+}
+
+pub(crate) fn state_to_digest(state: &[u32; 8]) -> [u8; 32] {
+    let mut out = [0u8; 32];
+    for (chunk, word) in out.chunks_exact_mut(4).zip(state) {
+        chunk.copy_from_slice(&word.to_be_bytes());
+    }
+    out
+}
+
+/// SHA-256 digest of `data`.
+pub fn digest(data: &[u8]) -> [u8; 32] {
+    digest_with(compress_fn(), data)
+}
+
+/// Lowercase hex encoding of the first eight digest bytes (16 characters).
+///
+/// Each half is spread into one nibble per byte and mapped to ASCII with
+/// branch-free SWAR arithmetic instead of a per-nibble lookup.
+pub fn hex16(digest: &[u8; 32]) -> String {
+    fn spread(x: u32) -> u64 {
+        let mut v = u64::from(x);
+        v = (v | (v << 16)) & 0x0000_ffff_0000_ffff;
+        v = (v | (v << 8)) & 0x00ff_00ff_00ff_00ff;
+        (v | (v << 4)) & 0x0f0f_0f0f_0f0f_0f0f
+    }
+    fn to_ascii(nibbles: u64) -> u64 {
+        // Nibbles above 9 carry into bit 4 once 6 is added; shift them up to 'a'..'f'.
+        let letters = ((nibbles + 0x0606_0606_0606_0606) >> 4) & 0x0101_0101_0101_0101;
+        nibbles + 0x3030_3030_3030_3030 + letters * 0x27
+    }
+
+    let hi = u32::from_be_bytes([digest[0], digest[1], digest[2], digest[3]]);
+    let lo = u32::from_be_bytes([digest[4], digest[5], digest[6], digest[7]]);
+    let mut out = [0u8; 16];
+    out[..8].copy_from_slice(&to_ascii(spread(hi)).to_be_bytes());
+    out[8..].copy_from_slice(&to_ascii(spread(lo)).to_be_bytes());
+    out.iter().map(|&b| char::from(b)).collect()
+}
+
+/// First 16 hex characters of the SHA-256 digest of every input.
+pub fn hash16_batch<T: AsRef<[u8]>>(inputs: &[T]) -> Vec<String> {
+    let compress = compress_fn();
+    inputs.iter().map(|data| hex16(&digest_with(compress, data.as_ref()))).collect()
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn hex(bytes: &[u8]) -> String {
+        bytes.iter().map(|b| format!("{b:02x}")).collect()
+    }
+
+    #[test]
+    fn known_digests() {
+        assert_eq!(
+            hex(&digest(b"")),
+            "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
+        );
+        assert_eq!(
+            hex(&digest(b"abc")),
+            "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
+        );
+        assert_eq!(
+            hex(&digest(b"abcdbcdecdefdefgefghfghighijhijkijkljklmklmnlmnomnopnopq")),
+            "248d6a61d20638b8e5c026930c3e6039a33ce45964ff2167f6ecedd419db06c1"
+        );
+    }
+
+    #[test]
+    fn kernels_agree_across_padding_boundaries() {
+        let data: Vec<u8> = (0..300u32).map(|i| (i * 7 + 3) as u8).collect();
+        let compress = compress_fn();
+        for len in 0..data.len() {
+            assert_eq!(digest_with(compress, &data[..len]), digest_with(compress_scalar, &data[..len]));
+        }
+    }
+
+    #[test]
+    fn padded_blocks_match_streaming_digest() {
+        let data: Vec<u8> = (0..200u32).map(|i| i as u8).collect();
+        for len in 0..data.len() {
+            let mut blocks = vec![[0xffu8; 64]; block_count(len)];
+            pad_into(&data[..len], &mut blocks);
+            let mut state = H0;
+            compress_scalar(&mut state, &blocks);
+            assert_eq!(state_to_digest(&state), digest(&data[..len]));
+        }
+    }
+
+    #[test]
+    fn hex16_matches_prefix_of_full_hex() {
+        for input in [&b""[..], b"abc", b"profile:user loves coffee"] {
+            let d = digest(input);
+            assert_eq!(hex16(&d), hex(&d)[..16]);
+        }
+    }
+
+    #[test]
+    fn batch_matches_single() {
+        let inputs = [&b"profile:a"[..], b"event:b", b""];
+        let expected: Vec<String> = inputs.iter().map(|i| hex16(&digest(i))).collect();
+        assert_eq!(hash16_batch(&inputs), expected);
+    }
+}
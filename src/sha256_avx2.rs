@@ -0,0 +1,180 @@
+//! Multi-buffer SHA-256: eight independent messages hashed in the lanes of AVX2 registers.
+//!
+//! Each of the eight working variables `a..h` is one `__m256i` holding that
+//! variable for eight messages, so one round instruction stream advances eight
+//! hashes at once. Messages are bucketed by padded block count so every lane in
+//! a group runs the same number of compressions.
+
+use std::collections::BTreeMap;
+use std::sync::OnceLock;
+
+use crate::sha256;
+
+const LANES: usize = 8;
+
+/// Whether the CPU supports AVX2.
+pub fn has_avx2() -> bool {
+    static HAS_AVX2: OnceLock<bool> = OnceLock::new();
+    *HAS_AVX2.get_or_init(|| {
+        #[cfg(target_arch = "x86_64")]
+        if is_x86_feature_detected!("avx2") {
+            return true;
+        }
+        false
+    })
+}
+
+#[cfg(target_arch = "x86_64")]
+mod lanes {
+    use super::LANES;
+    use crate::sha256::{H0, K};
+    use std::arch::x86_64::*;
+
+    macro_rules! rotr {
+        ($x:expr, $n:literal) => {
+            _mm256_or_si256(_mm256_srli_epi32::<$n>($x), _mm256_slli_epi32::<{ 32 - $n }>($x))
+        };
+    }
+
+    /// Hash eight padded messages of `n_blocks` blocks each.
+    ///
+    /// `blocks` is lane-major: lane `l` owns `blocks[l * n_blocks..(l + 1) * n_blocks]`.
+    ///
+    /// # Safety
+    ///
+    /// The CPU must support the `avx2` extension.
+    #[target_feature(enable = "avx2")]
+    pub(super) unsafe fn digest8(blocks: &[[u8; 64]], n_blocks: usize) -> [[u8; 32]; LANES] {
+        debug_assert_eq!(blocks.len(), LANES * n_blocks);
+        let mut state: [__m256i; 8] = H0.map(|h| _mm256_set1_epi32(h as i32));
+
+        for b in 0..n_blocks {
+            let word = |lane: usize, t: usize| {
+                let bytes = &blocks[lane * n_blocks + b][4 * t..4 * t + 4];
+                u32::from_be_bytes([bytes[0], bytes[1], bytes[2], bytes[3]]) as i32
+            };
+            let mut w = [_mm256_setzero_si256(); 16];
+            for (t, wt) in w.iter_mut().enumerate() {
+                *wt = _mm256_setr_epi32(
+                    word(0, t),
+                    word(1, t),
+                    word(2, t),
+                    word(3, t),
+                    word(4, t),
+                    word(5, t),
+                    word(6, t),
+                    word(7, t),
+                );
+            }
+
+            let [mut a, mut bb, mut c, mut d, mut e, mut f, mut g, mut h] = state;
+            for i in 0..64 {
+                if i >= 16 {
+                    let w15 = w[(i - 15) % 16];
+                    let w2 = w[(i - 2) % 16];
+                    let s0 = _mm256_xor_si256(_mm256_xor_si256(rotr!(w15, 7), rotr!(w15, 18)), _mm256_srli_epi32::<3>(w15));
+                    let s1 = _mm256_xor_si256(_mm256_xor_si256(rotr!(w2, 17), rotr!(w2, 19)), _mm256_srli_epi32::<10>(w2));
+                    w[i % 16] = _mm256_add_epi32(
+                        _mm256_add_epi32(w[i % 16], s0),
+                        _mm256_add_epi32(w[(i - 7) % 16], s1),
+                    );
+                }
+
+                let s1 = _mm256_xor_si256(_mm256_xor_si256(rotr!(e, 6), rotr!(e, 11)), rotr!(e, 25));
+                let ch = _mm256_xor_si256(_mm256_and_si256(e, f), _mm256_andnot_si256(e, g));
+                let t1 = _mm256_add_epi32(
+                    _mm256_add_epi32(_mm256_add_epi32(h, s1), _mm256_add_epi32(ch, w[i % 16])),
+                    _mm256_set1_epi32(K[i] as i32),
+                );
+                let s0 = _mm256_xor_si256(_mm256_xor_si256(rotr!(a, 2), rotr!(a, 13)), rotr!(a, 22));
+                let maj = _mm256_xor_si256(
+                    _mm256_xor_si256(_mm256_and_si256(a, bb), _mm256_and_si256(a, c)),
+                    _mm256_and_si256(bb, c),
+                );
+                h = g;
+                g = f;
+                f = e;
+                e = _mm256_add_epi32(d, t1);
+                d = c;
+                c = bb;
+                bb = a;
+                a = _mm256_add_epi32(t1, _mm256_add_epi32(s0, maj));
+            }
+
+            for (s, v) in state.iter_mut().zip([a, bb, c, d, e, f, g, h]) {
+                *s = _mm256_add_epi32(*s, v);
+            }
+        }
+
+        let mut words = [[0u32; LANES]; 8];
+        for (out, s) in words.iter_mut().zip(state) {
+            // SAFETY: `out` is 32 bytes long, exactly one unaligned 256-bit store.
+            unsafe { _mm256_storeu_si256(out.as_mut_ptr().cast::<__m256i>(), s) };
+        }
+        let mut digests = [[0u8; 32]; LANES];
+        for (lane, digest) in digests.iter_mut().enumerate() {
+            for (j, chunk) in digest.chunks_exact_mut(4).enumerate() {
+                chunk.copy_from_slice(&words[j][lane].to_be_bytes());
+            }
+        }
+        digests
+    }
+}
+
+/// First 16 hex characters of the SHA-256 digest of every input.
+///
+/// Full groups of eight same-length (in blocks) messages go through the AVX2
+/// kernel; leftovers, and every input on CPUs without AVX2, use the
+/// single-message path.
+pub fn hash16_many<T: AsRef<[u8]>>(inputs: &[T]) -> Vec<String> {
+    if inputs.len() < LANES || !has_avx2() {
+        return sha256::hash16_batch(inputs);
+    }
+
+    let mut out = vec![String::new(); inputs.len()];
+    let mut buckets: BTreeMap<usize, Vec<usize>> = BTreeMap::new();
+    for (i, data) in inputs.iter().enumerate() {
+        buckets.entry(sha256::block_count(data.as_ref().len())).or_default().push(i);
+    }
+
+    let mut blocks = Vec::new();
+    for (n_blocks, indices) in buckets {
+        let mut groups = indices.chunks_exact(LANES);
+        for group in groups.by_ref() {
+            blocks.clear();
+            blocks.resize(LANES * n_blocks, [0u8; 64]);
+            for (lane, &i) in group.iter().enumerate() {
+                sha256::pad_into(inputs[i].as_ref(), &mut blocks[lane * n_blocks..(lane + 1) * n_blocks]);
+            }
+            #[cfg(target_arch = "x86_64")]
+            {
+                // SAFETY: `has_avx2` confirmed the CPU supports AVX2.
+                let digests = unsafe { lanes::digest8(&blocks, n_blocks) };
+                for (&i, digest) in group.iter().zip(&digests) {
+                    out[i] = sha256::hex16(digest);
+                }
+            }
+        }
+        for &i in groups.remainder() {
+            out[i] = sha256::hex16(&sha256::digest(inputs[i].as_ref()));
+        }
+    }
+    out
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn matches_single_message_path() {
+        let inputs: Vec<Vec<u8>> = (0..300u32).map(|n| (0..n).map(|i| (i * 31 + n) as u8).collect()).collect();
+        assert_eq!(hash16_many(&inputs), sha256::hash16_batch(&inputs));
+    }
+
+    #[test]
+    fn small_batches_fall_back() {
+        let inputs = [&b"profile:a"[..], b"event:b", b""];
+        assert_eq!(hash16_many(&inputs), sha256::hash16_batch(&inputs));
+    }
+}
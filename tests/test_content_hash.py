@@ -0,0 +1,119 @@
+"""Tests for content hashing used by memory deduplication."""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for direct import - MUST be before any memu imports
+src_path = Path(__file__).parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# Import directly from the models file path to avoid circular import through database/__init__.py
+spec = importlib.util.spec_from_file_location("models", src_path / "memu" / "database" / "models.py")
+assert spec is not None
+assert spec.loader is not None
+models = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = models  # dataclasses resolve their module through sys.modules
+spec.loader.exec_module(models)
+
+compute_content_hash = models.compute_content_hash
+compute_content_hash_batch = models.compute_content_hash_batch
+compute_content_hash_many = models.compute_content_hash_many
+
+SUMMARIES = [
+    "User loves coffee",
+    "User  loves   coffee",
+    "USER LOVES COFFEE",
+    "User loves tea",
+    "",
+    "A much longer summary that spans more than a single SHA-256 block once the memory type prefix is added to it.",
+]
+
+
+class TestComputeContentHash:
+    """Tests for compute_content_hash normalization."""
+
+    def test_matches_split_join_normalization(self):
+        """Test normalization agrees with collapsing str.split() whitespace, including Unicode spaces."""
+        samples = [
+            "User loves coffee",
+            " User loves coffee",
+            "User loves coffee ",
+            "User\tloves\ncoffee",
+            "User\u00a0loves\u3000coffee",
+            "User\u2028loves\x1fcoffee",
+            "User\x00loves coffee",
+            "   ",
+            "",
+        ]
+        for summary in samples:
+            normalized = " ".join(summary.lower().split())
+            expected = hashlib.sha256(f"profile:{normalized}".encode()).hexdigest()[:16]
+            assert compute_content_hash(summary, "profile") == expected, repr(summary)
+
+
+class TestComputeContentHashBatch:
+    """Tests for compute_content_hash_batch."""
+
+    def test_matches_single_item_hash(self):
+        """Test batch hashes equal per-item hashes, in input order."""
+        expected = [compute_content_hash(summary, "profile") for summary in SUMMARIES]
+        assert compute_content_hash_batch(SUMMARIES, "profile") == expected
+
+    def test_normalizes_whitespace_and_case(self):
+        """Test batch hashing applies the same normalization as the single-item path."""
+        hashes = compute_content_hash_batch(SUMMARIES[:3], "profile")
+        assert len(set(hashes)) == 1
+        assert len(hashes[0]) == 16
+
+    def test_memory_type_is_part_of_hash(self):
+        """Test the same summary hashes differently per memory type."""
+        assert compute_content_hash_batch(SUMMARIES, "profile") != compute_content_hash_batch(SUMMARIES, "event")
+
+    def test_empty_batch(self):
+        """Test an empty batch returns an empty list."""
+        assert compute_content_hash_batch([], "profile") == []
+
+
+class TestComputeContentHashMany:
+    """Tests for compute_content_hash_many."""
+
+    def test_matches_single_item_hash(self):
+        """Test hashes of mixed-type pairs equal per-item hashes, in input order."""
+        # Enough items to fill several eight-wide groups of the same block count
+        items = [
+            (f"{summary} #{i}", memory_type)
+            for i in range(5)
+            for summary in SUMMARIES
+            for memory_type in ("profile", "event")
+        ]
+        expected = [compute_content_hash(summary, memory_type) for summary, memory_type in items]
+        assert compute_content_hash_many(items) == expected
+
+    def test_small_batch(self):
+        """Test batches smaller than one SIMD group."""
+        items = [("User loves coffee", "profile"), ("User loves coffee", "event")]
+        assert compute_content_hash_many(items) == [compute_content_hash(s, t) for s, t in items]
+
+
+class TestNativeBackend:
+    """Tests for the native extension's CPU dispatch."""
+
+    def test_backend_selection(self):
+        """Test the reported kernel is consistent with the CPU feature probe."""
+        core = pytest.importorskip("memu._core")
+        backend = core.sha256_backend()
+        assert backend in {"sha_ni", "avx2", "scalar"}
+        assert (backend == "sha_ni") == core.cpu_supports_shani()
+
+    def test_single_hash_matches_hashlib(self):
+        """Test the native single-input hash agrees with hashlib."""
+        core = pytest.importorskip("memu._core")
+        for data in (b"", b"profile:user loves coffee", bytes(range(256))):
+            assert core.sha256_16hex(data) == hashlib.sha256(data).hexdigest()[:16]
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import importlib.util
+import json
 import sys
+import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -21,6 +23,7 @@ spec = importlib.util.spec_from_file_location("models", src_path / "memu" / "dat
 assert spec is not None
 assert spec.loader is not None
 models = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = models  # dataclasses resolve their module through sys.modules
 spec.loader.exec_module(models)
 
 # Rebuild models to resolve forward references with proper namespace
@@ -36,6 +39,7 @@ models.MemoryItem.model_rebuild(_types_namespace=rebuild_ns)
 MemoryItem = models.MemoryItem
 MemoryType = models.MemoryType
 ToolCallResult = models.ToolCallResult
+ToolCallResultFast = models.ToolCallResultFast
 
 # Import tool memory utility functions
 util_tool_spec = importlib.util.spec_from_file_location("util_tool", src_path / "memu" / "utils" / "tool.py")
@@ -45,6 +49,8 @@ util_tool = importlib.util.module_from_spec(util_tool_spec)
 util_tool_spec.loader.exec_module(util_tool)
 
 add_tool_call = util_tool.add_tool_call
+add_tool_calls_batch = util_tool.add_tool_calls_batch
+get_tool_calls = util_tool.get_tool_calls
 get_tool_statistics = util_tool.get_tool_statistics
 
 
@@ -81,7 +87,7 @@ class TestToolCallResult:
 
         hash1 = result.generate_hash()
         assert hash1 != ""
-        assert len(hash1) == 32  # MD5 hex digest length
+        assert len(hash1) == 16  # xxh3-64 hex digest length
 
         # Same input/output should generate same hash
         result2 = ToolCallResult(
@@ -99,18 +105,83 @@ class TestToolCallResult:
         )
         assert result3.generate_hash() != hash1
 
-    def test_ensure_hash(self):
-        """Test ensure_hash sets call_hash if empty."""
+    def test_generate_hash_canonical_input(self):
+        """Test hash ignores dict key order but not value types."""
+        result = ToolCallResult(tool_name="search", input={"q": "coffee", "opts": {"limit": 5, "lang": "en"}})
+        reordered = ToolCallResult(tool_name="search", input={"opts": {"lang": "en", "limit": 5}, "q": "coffee"})
+        assert reordered.generate_hash() == result.generate_hash()
+
+        stringly = ToolCallResult(tool_name="search", input={"q": "coffee", "opts": {"limit": "5", "lang": "en"}})
+        assert stringly.generate_hash() != result.generate_hash()
+
+    def test_generate_hash_large_int_input(self):
+        """Test inputs outside orjson's 64-bit integer range still hash, and distinctly."""
+        result = ToolCallResult(tool_name="x", input={"n": 2**70})
+        other = ToolCallResult(tool_name="x", input={"n": 2**70 + 1})
+
+        assert len(result.generate_hash()) == 16
+        assert result.generate_hash() != other.generate_hash()
+
+    def test_generate_hash_non_finite_input(self):
+        """Test NaN and infinities don't hash like None, which orjson would encode them as."""
+        hashes = {
+            ToolCallResult(tool_name="x", input={"v": [value]}).generate_hash()
+            for value in (None, float("nan"), float("inf"), float("-inf"))
+        }
+
+        assert len(hashes) == 4
+
+    def test_generate_hash_rejects_unordered_input(self):
+        """Test set values raise instead of hashing a process-dependent string form."""
+        result = ToolCallResult(tool_name="x", input={"tags": {"a", "b"}})
+
+        with pytest.raises(TypeError):
+            result.generate_hash()
+
+    def test_call_hash_is_lazy(self):
+        """Test call_hash is computed on first access and included in model_dump()."""
         result = ToolCallResult(
             tool_name="test_tool",
             input="test input",
             output="test output",
         )
 
-        assert result.call_hash == ""
-        result.ensure_hash()
-        assert result.call_hash != ""
-        assert len(result.call_hash) == 32
+        assert "call_hash" not in result.__dict__
+        assert result.call_hash == result.generate_hash()
+        assert len(result.call_hash) == 16
+        assert result.model_dump(exclude_defaults=True)["call_hash"] == result.call_hash
+
+    def test_call_hash_follows_assignment(self):
+        """Test reassigning a hashed field recomputes call_hash, while other fields keep it."""
+        result = ToolCallResult(tool_name="echo", input="hello", output="hello")
+        first = result.call_hash
+
+        result.score = 1.0
+        assert result.call_hash == first
+
+        result.output = "HELLO"
+        assert result.call_hash != first
+        assert result.model_dump()["call_hash"] == result.generate_hash()
+
+    def test_call_hash_follows_model_copy_update(self):
+        """Test model_copy(update=...) recomputes call_hash only when a hashed field changes."""
+        result = ToolCallResult(tool_name="echo", input="hello", output="hello")
+        first = result.call_hash
+
+        assert result.model_copy(update={"score": 1.0}).call_hash == first
+
+        copied = result.model_copy(update={"output": "HELLO"})
+        assert copied.call_hash != first
+        assert copied.call_hash == copied.generate_hash()
+        assert result.call_hash == first
+
+    def test_stored_call_hash_is_kept(self):
+        """Test validating a stored record keeps its call_hash instead of recomputing it."""
+        stored = {"tool_name": "echo", "input": "hello", "output": "hello", "call_hash": "0123456789abcdef"}
+
+        assert ToolCallResult.model_validate(stored).call_hash == "0123456789abcdef"
+        assert ToolCallResult.model_validate_json(json.dumps(stored)).call_hash == "0123456789abcdef"
+        assert ToolCallResult.model_validate(stored).model_dump()["call_hash"] == "0123456789abcdef"
 
     def test_string_input(self):
         """Test ToolCallResult with string input."""
@@ -120,10 +191,41 @@ class TestToolCallResult:
             output="hello world",
         )
 
-        result.ensure_hash()
         assert result.call_hash != ""
 
 
+class TestToolCallResultFast:
+    """Tests for the validation-free ToolCallResultFast."""
+
+    def test_defaults_match_tool_call_result(self):
+        """Test the fast variant serializes like ToolCallResult.model_dump()."""
+        fast = ToolCallResultFast(tool_name="calculator", input={"a": 1, "b": 2}, output="3")
+        model = ToolCallResult(tool_name="calculator", input={"a": 1, "b": 2}, output="3")
+
+        fast_dict = fast.to_dict()
+        model_dict = model.model_dump()
+        assert fast_dict.keys() == model_dict.keys()
+        for key in ("tool_name", "input", "output", "success", "time_cost", "token_cost", "score", "call_hash"):
+            assert fast_dict[key] == model_dict[key]
+
+    def test_call_hash_follows_assignment(self):
+        """Test reassigning a hashed field recomputes the fast variant's call_hash."""
+        fast = ToolCallResultFast(tool_name="echo", input="hello", output="hello")
+        first = fast.call_hash
+
+        fast.input = {"text": "hello"}
+
+        assert fast.call_hash != first
+        assert fast.call_hash == fast.generate_hash()
+
+    def test_hash_matches_tool_call_result(self):
+        """Test both variants produce the same dedup hash."""
+        fast = ToolCallResultFast(tool_name="calculator", input={"a": 1, "b": 2}, output="3")
+        model = ToolCallResult(tool_name="calculator", input={"a": 1, "b": 2}, output="3")
+
+        assert fast.call_hash == model.call_hash
+
+
 class TestMemoryItemToolType:
     """Tests for MemoryItem with tool type."""
 
@@ -169,10 +271,134 @@ class TestMemoryItemToolType:
 
         add_tool_call(item, tool_call)
 
-        tool_calls = item.extra.get("tool_calls", [])
+        tool_calls = get_tool_calls(item)
         assert len(tool_calls) == 1
         assert tool_calls[0]["tool_name"] == "calculator"
-        assert tool_calls[0]["call_hash"] != ""  # ensure_hash was called
+        assert tool_calls[0]["call_hash"] != ""  # call_hash is computed on serialization
+
+    def test_add_tool_call_skips_defaults(self):
+        """Test stored tool calls omit default-valued fields and still aggregate correctly."""
+        item = MemoryItem(
+            resource_id=None,
+            memory_type="tool",
+            summary="calculator tool usage",
+        )
+
+        add_tool_call(item, ToolCallResult(tool_name="calculator", input="1+1", output="2", time_cost=0.2))
+        add_tool_call(item, ToolCallResultFast(tool_name="calculator", input="2+2", output="4"), omit_timestamp=True)
+
+        first, second = item.extra["tool_calls"]
+        assert "input" in first
+        assert "created_at" in first
+        assert second.keys() == {"tool_name", "input", "output", "call_hash"}
+
+        stats = get_tool_statistics(item)
+        assert stats["success_rate"] == 1.0
+        assert stats["avg_time_cost"] == pytest.approx(0.1)
+        assert stats["avg_token_cost"] == 0.0
+
+    def test_get_tool_calls_fills_defaults(self):
+        """Test fields left out of stored calls come back with ToolCallResult's defaults."""
+        item = MemoryItem(resource_id=None, memory_type="tool", summary="calculator tool usage")
+
+        add_tool_call(item, ToolCallResult(tool_name="x"), omit_timestamp=True)
+
+        (call,) = get_tool_calls(item)
+        assert item.extra["tool_calls"][0].keys() == {"tool_name", "call_hash"}
+        for name, field in ToolCallResult.model_fields.items():
+            if name not in {"tool_name", "created_at"}:
+                assert call[name] == field.default, name
+
+    def test_tool_call_defaults_agree(self):
+        """Test the defaults get_tool_calls fills in match both tool call classes' defaults."""
+        model_defaults = {
+            name: field.default
+            for name, field in ToolCallResult.model_fields.items()
+            if not field.is_required() and field.default_factory is None
+        }
+
+        assert model_defaults == util_tool._TOOL_CALL_DEFAULTS
+        assert model_defaults == models._TOOL_CALL_FAST_DEFAULTS
+
+    def test_add_tool_call_fast(self):
+        """Test adding a ToolCallResultFast to a tool memory."""
+        item = MemoryItem(
+            resource_id=None,
+            memory_type="tool",
+            summary="calculator tool usage",
+        )
+
+        add_tool_call(item, ToolCallResultFast(tool_name="calculator", input={"a": 1, "b": 2}, output="3"))
+
+        tool_calls = get_tool_calls(item)
+        assert len(tool_calls) == 1
+        assert tool_calls[0]["tool_name"] == "calculator"
+        assert tool_calls[0]["call_hash"] != ""
+
+    def test_add_tool_call_fast_copies_input(self):
+        """Test a stored fast call doesn't change when the caller later mutates its input."""
+        item = MemoryItem(resource_id=None, memory_type="tool", summary="calculator tool usage")
+        fast = ToolCallResultFast(tool_name="calculator", input={"args": {"a": 1}}, output="1")
+
+        add_tool_call(item, fast)
+        stored_hash = item.extra["tool_calls"][0]["call_hash"]
+        fast.input["args"]["a"] = 2
+
+        (call,) = get_tool_calls(item)
+        assert call["input"] == {"args": {"a": 1}}
+        assert call["call_hash"] == stored_hash
+
+    def test_add_tool_calls_batch(self):
+        """Test batch adding stores the same records as adding one call at a time."""
+        calls = [
+            ToolCallResult(tool_name="calculator", input={"a": i}, output=str(i), time_cost=0.1 * i, success=i % 2 == 0)
+            for i in range(5)
+        ]
+        single = MemoryItem(resource_id=None, memory_type="tool", summary="calculator tool usage")
+        batch = MemoryItem(resource_id=None, memory_type="tool", summary="calculator tool usage")
+
+        add_tool_call(single, calls[0])
+        add_tool_calls_batch(batch, calls[:1])
+        for call in calls[1:]:
+            add_tool_call(single, call)
+        add_tool_calls_batch(batch, calls[1:])
+
+        assert get_tool_calls(batch) == get_tool_calls(single)
+        assert get_tool_statistics(batch) == get_tool_statistics(single)
+
+    def test_add_tool_calls_batch_mixed(self):
+        """Test a batch mixing ToolCallResult and ToolCallResultFast stores the same records as single adds."""
+        calls = [
+            ToolCallResult(tool_name="calculator", input="1+1", output="2"),
+            ToolCallResultFast(tool_name="calculator", input="2+2", output="4", time_cost=0.3),
+        ]
+        single = MemoryItem(resource_id=None, memory_type="tool", summary="calculator tool usage")
+        batch = MemoryItem(resource_id=None, memory_type="tool", summary="calculator tool usage")
+
+        for call in calls:
+            add_tool_call(single, call, omit_timestamp=True)
+        add_tool_calls_batch(batch, calls, omit_timestamp=True)
+        add_tool_calls_batch(batch, calls[1:], omit_timestamp=True)
+
+        assert batch.extra["tool_calls"][:2] == single.extra["tool_calls"]
+        assert batch.extra["tool_calls"][2] == single.extra["tool_calls"][1]
+        assert all("_call_hash" not in call for call in batch.extra["tool_calls"])
+
+    def test_add_tool_call_without_extra(self):
+        """Test adding a tool call to an item constructed without an extra dict."""
+        item = MemoryItem.model_construct(resource_id=None, memory_type="tool", summary="calculator", extra=None)
+
+        add_tool_call(item, ToolCallResult(tool_name="calculator", input="1+1", output="2"))
+
+        assert len(get_tool_calls(item)) == 1
+        assert "extra" in item.model_fields_set
+
+    def test_add_tool_calls_batch_wrong_type(self):
+        """Test that add_tool_calls_batch fails for non-tool memories."""
+        item = MemoryItem(resource_id=None, memory_type="profile", summary="User profile info")
+
+        with pytest.raises(ValueError, match="tool type memories"):
+            add_tool_calls_batch(item, [ToolCallResult(tool_name="test")])
 
     def test_add_tool_call_wrong_type(self):
         """Test that add_tool_call fails for non-tool memories."""
@@ -279,6 +505,84 @@ class TestMemoryItemToolType:
         assert stats["recent_calls_analyzed"] == 2
         assert stats["success_rate"] == 1.0  # Both recent calls succeeded
 
+    def test_get_tool_statistics_many_calls(self):
+        """Test statistics over a window longer than the default recent_n."""
+        calls: list[dict[str, Any]] = []
+        for i in range(40):
+            call: dict[str, Any] = {"tool_name": "t", "time_cost": 0.1 * (i % 4), "score": 0.5}
+            if i % 5 == 0:
+                call["success"] = False
+            if i % 2 == 0:
+                call["token_cost"] = 10 * (i % 3)
+            calls.append(call)
+        item = MemoryItem(resource_id=None, memory_type="tool", summary="busy tool", extra={"tool_calls": calls})
+
+        stats = get_tool_statistics(item, recent_n=40)
+
+        assert stats["recent_calls_analyzed"] == 40
+        assert stats["avg_time_cost"] == pytest.approx(0.15)
+        assert stats["success_rate"] == pytest.approx(0.8)
+        assert stats["avg_score"] == pytest.approx(0.5)
+        expected_tokens = sum(10 * (i % 3) for i in range(0, 40, 2)) / 20
+        assert stats["avg_token_cost"] == pytest.approx(round(expected_tokens, 2))
+
+    def test_get_tool_statistics_after_round_trip(self):
+        """Test statistics over 16+ calls still work after a dump and reload of the item."""
+        item = MemoryItem(resource_id=None, memory_type="tool", summary="busy tool")
+        for i in range(20):
+            add_tool_call(
+                item, ToolCallResult(tool_name="t", output=str(i), time_cost=0.1, token_cost=i, success=i % 4 != 0)
+            )
+        expected = get_tool_statistics(item)
+
+        reloaded = MemoryItem.model_validate(item.model_dump())
+        reloaded_json = MemoryItem.model_validate_json(item.model_dump_json())
+
+        assert expected["recent_calls_analyzed"] == 20
+        assert get_tool_statistics(reloaded) == expected
+        assert get_tool_statistics(reloaded_json) == expected
+
+    def test_reads_do_not_modify_stored_calls(self):
+        """Test reading tool calls and statistics leaves the stored list of dicts untouched."""
+        stored = [
+            {"tool_name": "calc", "input": "1+1", "output": "2", "time_cost": 0.1, "token_cost": 10},
+            {"tool_name": "calc", "input": "bad", "output": "error", "success": False},
+        ]
+        item = MemoryItem(
+            resource_id=None,
+            memory_type="tool",
+            summary="calculator tool",
+            extra={"tool_calls": [dict(call) for call in stored]},
+        )
+
+        tool_calls = get_tool_calls(item)
+        stats = get_tool_statistics(item)
+
+        assert item.extra == {"tool_calls": stored}
+        assert [call["input"] for call in tool_calls] == ["1+1", "bad"]
+        assert tool_calls[0]["token_cost"] == 10
+        assert tool_calls[1]["token_cost"] == -1
+        assert stats["avg_time_cost"] == pytest.approx(0.05)
+
+        add_tool_call(item, ToolCallResult(tool_name="calc", input="2+2", output="4"))
+        assert get_tool_statistics(item)["total_calls"] == 3
+
+    def test_extra_stays_json_serializable(self):
+        """Test extra holds only plain JSON values after adding tool calls, as JSON columns require."""
+        item = MemoryItem(resource_id=None, memory_type="tool", summary="calculator tool")
+        add_tool_call(
+            item,
+            ToolCallResult(tool_name="calc", input="1+1", output="2", time_cost=0.5, token_cost=7),
+            omit_timestamp=True,
+        )
+        get_tool_statistics(item)
+
+        stored = json.loads(json.dumps(item.extra))
+
+        assert stored["tool_calls"][0]["time_cost"] == 0.5
+        assert stored["tool_calls"][0]["token_cost"] == 7
+        assert get_tool_calls(item)[0]["success"] is True
+
 
 class TestMemoryItemNewFields:
     """Tests for tool-related fields stored in extra."""
@@ -325,3 +629,16 @@ class TestMemoryItemNewFields:
         assert item.extra.get("when_to_use") is None
         assert item.extra.get("metadata") is None
         assert item.extra.get("tool_calls") is None
+
+    def test_ids_are_time_ordered_uuid7(self):
+        """Test record ids are unique UUIDv7 strings that sort by creation time."""
+        ids = [MemoryItem(resource_id=None, memory_type="profile", summary="s").id for _ in range(100)]
+
+        assert len(set(ids)) == len(ids)
+        for item_id in ids:
+            parsed = uuid.UUID(item_id)
+            assert str(parsed) == item_id
+            assert parsed.version == 7
+            assert parsed.variant == uuid.RFC_4122
+        timestamps = [int(item_id.replace("-", "")[:12], 16) for item_id in ids]
+        assert timestamps == sorted(timestamps)